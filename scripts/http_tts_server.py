@@ -2,22 +2,46 @@
 """
 Small HTTP TTS endpoint for Teddy.
 
-POST /speak  JSON: {"text":"Hello Teddy", "rate":140}
+POST /speak        JSON: {"text":"Hello Teddy", "rate":140} -> 202 {"ok":true,"id":"<job id>"}
+GET  /status/<id>  job state: queued | synthesizing | playing | played | failed
 GET  /health
 
 Behavior:
-- Uses espeak to synthesize a WAV to /tmp/teddy_speak.wav
-- Plays the WAV to the configured USB speaker device (default "usbout")
-- Also plays the WAV into the ALSA loopback (default "plughw:Loopback,0,0")
-- Returns JSON {"ok":true,"msg":"played"} on success
+- Synthesizes in-process via libespeak(-ng) when it can be loaded and streams
+  the PCM straight to the USB speaker (default "usbout") and the ALSA loopback
+  (default "plughw:Loopback,0,0") through long-lived python-alsaaudio handles
+- Otherwise synthesizes a WAV under /tmp with the espeak CLI and plays it to
+  both devices with aplay
+- Caches rendered WAVs by hash of (rate, text) under TTS_CACHE_DIR
+  (default $XDG_CACHE_HOME/teddy-tts, i.e. ~/.cache/teddy-tts) so repeated
+  phrases skip synthesis
+- /speak validates the request and returns 202 immediately; synthesis and
+  playback run as a background job whose progress is reported by /status
+
+Runs as an async FastAPI app on uvicorn (pip install fastapi uvicorn).
 """
 import os
+import asyncio
+import ctypes
+import ctypes.util
+import hashlib
+import uuid
 import tempfile
 import subprocess
+import threading
+import wave
 import logging
-from flask import Flask, request, jsonify
+from collections import OrderedDict
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+try:
+    import alsaaudio
+except Exception:
+    alsaaudio = None
 
-app = Flask(__name__)
+app = FastAPI()
 logging.basicConfig(level=logging.INFO)
 log = logging.getLogger("teddy-http")
 
@@ -25,69 +49,360 @@ log = logging.getLogger("teddy-http")
 USB_DEVICE = os.environ.get("TTS_USB_DEVICE", "usbout")
 LOOPBACK_DEVICE = os.environ.get("TTS_LOOPBACK_DEVICE", "plughw:Loopback,0,0")
 ESPEAK_RATE = int(os.environ.get("TTS_ESPEAK_RATE", "140"))
+PERIOD_MS = int(os.environ.get("TTS_PERIOD_MS", "60"))
+# per-user default: the shipped unit runs as a normal user (systemd --user)
+CACHE_DIR = os.environ.get("TTS_CACHE_DIR") or os.path.join(
+    os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"), "teddy-tts")
+CACHE_MAX_MB = float(os.environ.get("TTS_CACHE_MAX_MB", "50"))
+MAX_JOBS = int(os.environ.get("TTS_MAX_JOBS", "100"))
+
+# libespeak API constants (speak_lib.h)
+_AUDIO_OUTPUT_SYNCHRONOUS = 2
+_ESPEAK_PARAM_RATE = 1
+_POS_CHARACTER = 1
+_ESPEAK_CHARS_UTF8 = 1
+_SYNTH_CALLBACK = ctypes.CFUNCTYPE(ctypes.c_int, ctypes.POINTER(ctypes.c_short), ctypes.c_int, ctypes.c_void_p)
+
+class LibEspeak:
+    """
+    Long-lived in-process espeak engine (libespeak-ng or libespeak).
+    synth() returns raw 16-bit mono PCM at self.sample_rate.
+    """
+    def __init__(self, lib):
+        self._lib = lib
+        lib.espeak_Initialize.argtypes = [ctypes.c_int, ctypes.c_int, ctypes.c_char_p, ctypes.c_int]
+        lib.espeak_Initialize.restype = ctypes.c_int
+        lib.espeak_SetSynthCallback.argtypes = [_SYNTH_CALLBACK]
+        lib.espeak_SetSynthCallback.restype = None
+        lib.espeak_SetParameter.argtypes = [ctypes.c_int, ctypes.c_int, ctypes.c_int]
+        lib.espeak_SetParameter.restype = ctypes.c_int
+        lib.espeak_Synth.argtypes = [ctypes.c_char_p, ctypes.c_size_t, ctypes.c_uint, ctypes.c_int,
+                                     ctypes.c_uint, ctypes.c_uint, ctypes.c_void_p, ctypes.c_void_p]
+        lib.espeak_Synth.restype = ctypes.c_int
+        self.sample_rate = lib.espeak_Initialize(_AUDIO_OUTPUT_SYNCHRONOUS, 0, None, 0)
+        if self.sample_rate <= 0:
+            raise OSError("espeak_Initialize failed")
+        # libespeak is not re-entrant; one synthesis at a time
+        self._lock = threading.Lock()
+        self._chunks = []
+        # keep a reference so the callback isn't garbage collected
+        self._callback = _SYNTH_CALLBACK(self._on_samples)
+        lib.espeak_SetSynthCallback(self._callback)
+
+    def _on_samples(self, wav, numsamples, events):
+        if wav and numsamples > 0:
+            self._chunks.append(ctypes.string_at(wav, numsamples * 2))
+        return 0
+
+    def synth(self, text: str, rate: int) -> bytes:
+        data = text.encode("utf-8") + b"\0"
+        with self._lock:
+            self._chunks = []
+            self._lib.espeak_SetParameter(_ESPEAK_PARAM_RATE, int(rate), 0)
+            err = self._lib.espeak_Synth(data, len(data), 0, _POS_CHARACTER, 0, _ESPEAK_CHARS_UTF8, None, None)
+            pcm = b"".join(self._chunks)
+            self._chunks = []
+        if err != 0:
+            raise RuntimeError(f"espeak_Synth failed ({err})")
+        return pcm
+
+    def synth_to_wav(self, text: str, rate: int, path: str):
+        _write_wav(path, self.synth(text, rate), self.sample_rate)
+
+def _write_wav(path: str, pcm: bytes, sample_rate: int):
+    with wave.open(path, "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(sample_rate)
+        w.writeframes(pcm)
+
+def _load_libespeak():
+    for name in ("espeak-ng", "espeak"):
+        libpath = ctypes.util.find_library(name)
+        if not libpath:
+            continue
+        try:
+            engine = LibEspeak(ctypes.CDLL(libpath))
+            log.info("Using in-process %s (%s Hz)", libpath, engine.sample_rate)
+            return engine
+        except Exception as e:
+            log.warning("Failed to initialize %s: %s", libpath, e)
+    log.info("libespeak not available — falling back to espeak CLI")
+    return None
+
+ESPEAK_LIB = _load_libespeak()
+
+class PcmPlayer:
+    """
+    Keeps one ALSA playback handle per device open and writes each chunk of
+    16-bit mono PCM to all of them (tee to speaker + loopback). A device that
+    is missing or fails is reopened at the start of the next utterance.
+    """
+    def __init__(self, devices, rate):
+        self.rate = rate
+        self.period_frames = max(1, rate * PERIOD_MS // 1000)
+        self.period_bytes = self.period_frames * 2
+        self._pcms = {device: None for device in devices}
+        # devices already warned about, so an unplugged speaker warns once per outage
+        self._failed = set()
+        # one utterance at a time; concurrent writers would interleave periods
+        self._lock = threading.Lock()
+        for device in devices:
+            self._open(device)
+
+    def _open(self, device):
+        try:
+            pcm = alsaaudio.PCM(alsaaudio.PCM_PLAYBACK, device=device)
+            pcm.setchannels(1)
+            pcm.setrate(self.rate)
+            pcm.setformat(alsaaudio.PCM_FORMAT_S16_LE)
+            pcm.setperiodsize(self.period_frames)
+        except Exception as e:
+            if device in self._failed:
+                log.debug("ALSA playback device %s still unavailable: %s", device, e)
+            else:
+                log.warning("Failed to open ALSA playback device %s: %s", device, e)
+                self._failed.add(device)
+            return None
+        if device in self._failed:
+            log.info("ALSA playback device %s reopened", device)
+            self._failed.discard(device)
+        self._pcms[device] = pcm
+        return pcm
+
+    def _drop(self, device, err):
+        log.warning("ALSA write to %s failed, reopening next utterance: %s", device, err)
+        self._failed.add(device)
+        handle = self._pcms.get(device)
+        self._pcms[device] = None
+        try:
+            handle.close()
+        except Exception:
+            pass
+
+    def play(self, pcm: bytes):
+        with self._lock:
+            for device, handle in self._pcms.items():
+                if handle is None:
+                    self._open(device)
+            for off in range(0, len(pcm), self.period_bytes):
+                chunk = pcm[off:off + self.period_bytes]
+                if len(chunk) < self.period_bytes:
+                    # pad the tail to a full period with silence
+                    chunk += b"\0" * (self.period_bytes - len(chunk))
+                for device, handle in self._pcms.items():
+                    if handle is None:
+                        continue
+                    try:
+                        handle.write(chunk)
+                    except Exception as e:
+                        self._drop(device, e)
+
+PLAYER = None
+if ESPEAK_LIB is not None and alsaaudio is not None:
+    PLAYER = PcmPlayer([USB_DEVICE, LOOPBACK_DEVICE], ESPEAK_LIB.sample_rate)
+
+def _init_cache_dir():
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        return CACHE_DIR
+    except OSError as e:
+        log.warning("TTS cache disabled, cannot create %s: %s", CACHE_DIR, e)
+        return None
+
+TTS_CACHE = _init_cache_dir()
 
-def synthesize_text(text: str, rate: int = ESPEAK_RATE):
-    fd, path = tempfile.mkstemp(prefix="teddy_tts_", suffix=".wav", dir="/tmp")
+def _cache_path(text: str, rate: int):
+    if TTS_CACHE is None:
+        return None
+    key = hashlib.blake2b(f"{rate}:{text}".encode("utf-8"), digest_size=16).hexdigest()
+    return os.path.join(TTS_CACHE, f"{key}.wav")
+
+def _cache_touch(path: str) -> bool:
+    # explicit utime keeps LRU order correct on noatime/relatime mounts
+    try:
+        os.utime(path)
+        return True
+    except OSError:
+        return False
+
+def _cache_store(tmp_path: str, path: str):
+    os.replace(tmp_path, path)
+    # LRU eviction by access time once the cache exceeds CACHE_MAX_MB
+    try:
+        entries = []
+        for name in os.listdir(TTS_CACHE):
+            if name.endswith(".wav"):
+                p = os.path.join(TTS_CACHE, name)
+                entries.append((os.stat(p), p))
+        total = sum(st.st_size for st, _ in entries)
+        limit = CACHE_MAX_MB * 1024 * 1024
+        for st, p in sorted(entries, key=lambda e: e[0].st_atime):
+            if total <= limit:
+                break
+            if p != path:
+                os.remove(p)
+                total -= st.st_size
+    except OSError as e:
+        log.debug("TTS cache eviction failed: %s", e)
+
+def _synth_pcm(text: str, rate: int) -> bytes:
+    """PCM for text via libespeak, served from the WAV cache when possible."""
+    path = _cache_path(text, rate)
+    if path is not None:
+        try:
+            with wave.open(path, "rb") as w:
+                if w.getframerate() == ESPEAK_LIB.sample_rate and w.getsampwidth() == 2 and w.getnchannels() == 1:
+                    pcm = w.readframes(w.getnframes())
+                    _cache_touch(path)
+                    log.info("TTS cache hit: %s", path)
+                    return pcm
+        except (OSError, EOFError, wave.Error):
+            pass
+    log.info("Synthesizing in-process: %s", text)
+    pcm = ESPEAK_LIB.synth(text, rate)
+    if path is not None:
+        try:
+            fd, tmp = tempfile.mkstemp(suffix=".tmp", dir=TTS_CACHE)
+            os.close(fd)
+            _write_wav(tmp, pcm, ESPEAK_LIB.sample_rate)
+            _cache_store(tmp, path)
+        except OSError as e:
+            log.debug("TTS cache write failed: %s", e)
+    return pcm
+
+# keep references to fire-and-forget playback tasks until they finish
+_tasks = set()
+
+def _spawn(coro):
+    task = asyncio.ensure_future(coro)
+    _tasks.add(task)
+    task.add_done_callback(_tasks.discard)
+    return task
+
+async def synthesize_text(text: str, rate: int = ESPEAK_RATE):
+    cached = _cache_path(text, rate)
+    if cached is not None and _cache_touch(cached):
+        log.info("TTS cache hit: %s", cached)
+        return cached
+    if cached is not None:
+        fd, path = tempfile.mkstemp(suffix=".tmp", dir=TTS_CACHE)
+    else:
+        fd, path = tempfile.mkstemp(prefix="teddy_tts_", suffix=".wav", dir="/tmp")
     os.close(fd)
-    # espeak writes to file with -w
-    cmd = ["espeak", "-s", str(rate), "-w", path, text]
-    log.info("Synthesizing: %s", " ".join(cmd))
     try:
-        subprocess.run(cmd, check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-        return path
-    except subprocess.CalledProcessError as e:
+        if ESPEAK_LIB is not None:
+            log.info("Synthesizing in-process: %s", text)
+            await asyncio.to_thread(ESPEAK_LIB.synth_to_wav, text, rate, path)
+        else:
+            # espeak writes to file with -w
+            cmd = ["espeak", "-s", str(rate), "-w", path, text]
+            log.info("Synthesizing: %s", " ".join(cmd))
+            proc = await asyncio.create_subprocess_exec(*cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+            out, err = await proc.communicate()
+            if proc.returncode != 0:
+                raise subprocess.CalledProcessError(proc.returncode, cmd, out, err)
+    except Exception as e:
         log.exception("espeak failed: %s", e)
         if os.path.exists(path):
             os.remove(path)
         raise
+    if cached is not None:
+        _cache_store(path, cached)
+        return cached
+    return path
 
-def play_file_to_device(path: str, device: str):
+async def play_file_to_device(path: str, device: str):
     # use aplay for low-overhead playback
     cmd = ["aplay", "-D", device, path]
     log.info("Playing %s to %s", path, device)
-    # start asynchronously and return the Popen so caller can continue
-    p = subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    # start asynchronously and return the process so caller can continue
+    p = await asyncio.create_subprocess_exec(*cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
     return p
 
-@app.route("/health", methods=["GET"])
-def health():
-    return jsonify({"ok": True, "usb_device": USB_DEVICE, "loopback_device": LOOPBACK_DEVICE})
+# recent /speak jobs by id, oldest evicted first
+_jobs = OrderedDict()
+
+def _new_job():
+    job_id = uuid.uuid4().hex
+    _jobs[job_id] = {"id": job_id, "state": "queued"}
+    while len(_jobs) > MAX_JOBS:
+        _jobs.popitem(last=False)
+    return _jobs[job_id]
+
+async def _speak_job(job, text: str, rate: int):
+    job["state"] = "synthesizing"
+    if PLAYER is not None:
+        # in-process path: no tempfile, no aplay
+        try:
+            pcm = await asyncio.to_thread(_synth_pcm, text, rate)
+        except Exception as e:
+            log.exception("libespeak failed: %s", e)
+            job.update(state="failed", error="synthesis failed", detail=str(e))
+            return
+        job["state"] = "playing"
+        await asyncio.to_thread(PLAYER.play, pcm)
+        job["state"] = "played"
+        return
 
-@app.route("/speak", methods=["POST"])
-def speak():
-    body = request.get_json(silent=True)
-    if not body or "text" not in body:
-        return jsonify({"ok": False, "error": "missing 'text' field"}), 400
-    text = body["text"]
-    rate = int(body.get("rate", ESPEAK_RATE))
     try:
-        wav = synthesize_text(text, rate=rate)
+        wav = await synthesize_text(text, rate=rate)
     except Exception as e:
-        return jsonify({"ok": False, "error": "synthesis failed", "detail": str(e)}), 500
+        job.update(state="failed", error="synthesis failed", detail=str(e))
+        return
 
     # Play to USB speaker (audible)
     try:
-        p_usb = play_file_to_device(wav, USB_DEVICE)
+        p_usb = await play_file_to_device(wav, USB_DEVICE)
     except Exception as e:
         log.exception("Failed to play to USB device: %s", e)
         p_usb = None
 
     # Play into loopback so Teddy's VAD sees it and animates mouth/eyes
     try:
-        p_lb = play_file_to_device(wav, LOOPBACK_DEVICE)
+        p_lb = await play_file_to_device(wav, LOOPBACK_DEVICE)
     except Exception as e:
         log.exception("Failed to play to loopback device: %s", e)
         p_lb = None
 
-    # don't wait for playback to finish — return quickly
-    # cleanup wav file after a short delay in background to avoid removing while playing (best-effort)
+    job.update(state="playing", usb_pid=p_usb.pid if p_usb else None, loopback_pid=p_lb.pid if p_lb else None)
+    for p in (p_usb, p_lb):
+        if p is not None:
+            await p.wait()
+    # remove an uncached wav once both players have exited
+    if TTS_CACHE is None:
+        try:
+            os.remove(wav)
+        except OSError:
+            pass
+    job["state"] = "played"
+
+@app.get("/health")
+async def health():
+    return {"ok": True, "usb_device": USB_DEVICE, "loopback_device": LOOPBACK_DEVICE}
+
+@app.post("/speak")
+async def speak(request: Request):
     try:
-        subprocess.Popen(["/bin/sh", "-c", f"sleep 2 && rm -f {wav}"], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        body = await request.json()
     except Exception:
-        pass
+        body = None
+    if not isinstance(body, dict) or "text" not in body:
+        return JSONResponse({"ok": False, "error": "missing 'text' field"}, status_code=400)
+    text = body["text"]
+    rate = int(body.get("rate", ESPEAK_RATE))
+    # synthesis + playback run in the background; the client can poll /status
+    job = _new_job()
+    _spawn(_speak_job(job, text, rate))
+    return JSONResponse({"ok": True, "id": job["id"]}, status_code=202)
 
-    return jsonify({"ok": True, "msg": "played", "usb_pid": p_usb.pid if p_usb else None, "loopback_pid": p_lb.pid if p_lb else None})
+@app.get("/status/{job_id}")
+async def status(job_id: str):
+    job = _jobs.get(job_id)
+    if job is None:
+        return JSONResponse({"ok": False, "error": "unknown job id"}, status_code=404)
+    return {"ok": job["state"] != "failed", **job}
 
 if __name__ == "__main__":
-    # bind to all interfaces, port 5001
-    app.run(host="0.0.0.0", port=5001, threaded=True)
+    # bind to all interfaces, port 5001; loop="auto" picks uvloop when installed
+    uvicorn.run(app, host="0.0.0.0", port=5001, loop="auto")
@@ -3,9 +3,8 @@
 Quick script to sanity-check the Goertzel implementation in speech_detector.
 Generates a pure sine and prints computed vocalness pieces.
 """
-import math
-import struct
 import os
+import numpy as np
 from src.speech_detector import SpeechDetector
 from src.config import load_config
 
@@ -15,11 +14,11 @@ sd = SpeechDetector(cfg)
 
 def make_sine(freq, sr=44100, dur=0.1, amp=0.5):
     n = int(sr*dur)
-    samples = [amp*math.sin(2*math.pi*freq*i/sr) for i in range(n)]
+    t = np.arange(n) / sr
+    samples = amp * np.sin(2*np.pi*freq*t)
     # convert to 16-bit PCM bytes
-    ints = [int(max(-32767, min(32767, int(s*32767)))) for s in samples]
-    raw = struct.pack("<" + "h"*len(ints), *ints)
-    return raw
+    ints = (samples * 32767).clip(-32767, 32767).astype("<i2")
+    return ints.tobytes()
 
 if __name__ == "__main__":
     for f in (300, 500, 1000, 2000):
@@ -0,0 +1,81 @@
+"""
+Compiled Goertzel and frame-feature kernels for speech_detector.
+Uses numba if available, otherwise falls back to plain Python loops
+(features is None without numba; speech_detector uses NumPy instead).
+The frame kernels take raw int16 samples and return values in full-scale units.
+"""
+import numpy as np
+
+try:
+    from numba import njit, types
+except Exception:
+    njit = None
+
+def _goertzel_power_batch_nb(x, coeffs):
+    # x: raw int16 samples; all bins advance together per sample and the inner
+    # loop vectorizes across bins. Returns power |X|^2 (no sqrt); it is
+    # quadratic in x, so the 1/32768^2 scale is applied once at the end.
+    m = coeffs.shape[0]
+    s_prev = np.zeros(m)
+    s_prev2 = np.zeros(m)
+    for i in range(x.shape[0]):
+        v = float(x[i])
+        for k in range(m):
+            s = v + coeffs[k] * s_prev[k] - s_prev2[k]
+            s_prev2[k] = s_prev[k]
+            s_prev[k] = s
+    power = np.empty(m)
+    for k in range(m):
+        power[k] = max(0.0, s_prev2[k]*s_prev2[k] + s_prev[k]*s_prev[k]
+                       - coeffs[k]*s_prev[k]*s_prev2[k]) * (1.0 / (32768.0 * 32768.0))
+    return power
+
+def _features_nb(x):
+    # one pass over raw int16: integer sum of squares and count of sign
+    # changes (x > 0 vs x <= 0); int64 so full-scale frames can't overflow
+    n = x.shape[0]
+    sumsq = 0
+    zc = 0
+    prev = x[0] > 0
+    for i in range(n):
+        v = np.int64(x[i])
+        sumsq += v * v
+        cur = v > 0
+        if cur != prev:
+            zc += 1
+        prev = cur
+    return sumsq, zc
+
+# True when the kernels below are numba-compiled
+compiled = njit is not None
+
+if njit is not None:
+    # eager signatures: compiled (or loaded from cache) at import, so the first
+    # audio frame doesn't pay for it. Frames are contiguous int16, read-only when
+    # they are np.frombuffer views of bytes; state stays float64 so the
+    # recurrence doesn't drift on long frames.
+    _i2 = types.Array(types.int16, 1, "C")
+    _i2_ro = types.Array(types.int16, 1, "C", readonly=True)
+    _f8 = types.Array(types.float64, 1, "C")
+    _feat = types.Tuple((types.int64, types.int64))
+    goertzel_power_batch = njit([_f8(_i2_ro, _f8), _f8(_i2, _f8)], cache=True, fastmath=True)(_goertzel_power_batch_nb)
+    features = njit([_feat(_i2_ro), _feat(_i2)], cache=True, fastmath=True)(_features_nb)
+else:
+    features = None
+
+    def _goertzel_state(xs, coeff):
+        s_prev = 0.0
+        s_prev2 = 0.0
+        for v in xs:
+            s = v + coeff * s_prev - s_prev2
+            s_prev2 = s_prev
+            s_prev = s
+        return s_prev, s_prev2
+
+    def goertzel_power_batch(x, coeffs):
+        # per-bin passes over a list beat per-sample ndarray ops in the interpreter;
+        # the powers are then taken for all bins in one vectorized expression
+        xs = x.tolist()
+        st = np.array([_goertzel_state(xs, c) for c in coeffs.tolist()]).reshape(-1, 2)
+        s1, s2 = st[:, 0], st[:, 1]
+        return np.maximum(0.0, s2*s2 + s1*s1 - coeffs*s1*s2) * (1.0 / (32768.0 * 32768.0))
@@ -4,9 +4,10 @@ Provides a simple get_frame() and get_levels() API.
 """
 import threading
 import time
-import struct
-import math
+import select
 from collections import deque
+from typing import NamedTuple
+import numpy as np
 from src.logger import get_logger
 
 try:
@@ -14,6 +15,13 @@ try:
 except Exception:
     alsaaudio = None
 
+class LevelSnap(NamedTuple):
+    rms: float
+    zcr: float
+    peak: float
+    ts: float
+    raw: bytes
+
 class AudioCapture:
     def __init__(self, config):
         self.config = config
@@ -21,12 +29,16 @@ class AudioCapture:
         self.rate = int(config["audio"].get("sample_rate", 44100))
         self.channels = int(config["audio"].get("channels", 1))
         self.framesize = int(config["audio"].get("frame_size", 2048))
+        # ALSA ring buffer = periods * framesize
+        self.periods = int(config["audio"].get("periods", 4))
         self._running = False
         self._thread = None
-        self._latest = {"rms": 0.0, "zcr": 0.0, "peak": 0.0, "ts": time.time(), "raw": b""}
-        self._lock = threading.Lock()
+        # published snapshot; immutable and replaced wholesale so readers need no lock
+        self._latest = LevelSnap(0.0, 0.0, 0.0, time.time(), b"")
         self.log = get_logger()
         self._pcm = None
+        # reused by _compute_levels (capture thread only) to avoid per-frame allocation
+        self._scratch = np.empty(self.framesize, dtype=np.float32)
 
     def start(self):
         if self._thread:
@@ -35,49 +47,85 @@ class AudioCapture:
             self.log.warning("python-alsaaudio not available — audio capture disabled (simulated)")
             return
         try:
-            self._pcm = alsaaudio.PCM(alsaaudio.PCM_CAPTURE, device=self.device)
-            self._pcm.setchannels(self.channels)
-            self._pcm.setrate(self.rate)
-            self._pcm.setformat(alsaaudio.PCM_FORMAT_S16_LE)
-            self._pcm.setperiodsize(self.framesize)
+            self._pcm = self._open_pcm()
         except Exception as e:
             self.log.warning("Failed to open ALSA device: %s", e)
             return
+        try:
+            info = self._pcm.info()
+            self.log.debug("ALSA capture %s: period=%s buffer=%s frames (%s periods)", self.device,
+                           info.get("period_size"), info.get("buffer_size"), info.get("periods"))
+        except Exception:
+            pass
         self._running = True
         self._thread = threading.Thread(target=self._thread_main, daemon=True)
         self._thread.start()
 
+    def _open_pcm(self):
+        try:
+            # pyalsaaudio >= 0.10 sets period size and period count (buffer) at open;
+            # non-blocking so the capture thread waits in poll() instead of read()
+            return alsaaudio.PCM(alsaaudio.PCM_CAPTURE, alsaaudio.PCM_NONBLOCK, device=self.device,
+                                 channels=self.channels, rate=self.rate,
+                                 format=alsaaudio.PCM_FORMAT_S16_LE,
+                                 periodsize=self.framesize, periods=self.periods)
+        except TypeError:
+            # older pyalsaaudio: no keyword args, buffer size left to ALSA defaults
+            pcm = alsaaudio.PCM(alsaaudio.PCM_CAPTURE, alsaaudio.PCM_NONBLOCK, device=self.device)
+            pcm.setchannels(self.channels)
+            pcm.setrate(self.rate)
+            pcm.setformat(alsaaudio.PCM_FORMAT_S16_LE)
+            pcm.setperiodsize(self.framesize)
+            return pcm
+
     def stop(self):
         self._running = False
         if self._thread:
             self._thread.join(timeout=1.0)
 
     def _compute_levels(self, raw):
-        if not raw:
-            return {"rms": 0.0, "zcr": 0.0, "peak": 0.0}
         # 16-bit signed little-endian mono
-        fmt = "<" + "h" * (len(raw) // 2)
-        samples = struct.unpack(fmt, raw)
-        # RMS
-        ssum = sum((s/32768.0)**2 for s in samples)
-        rms = math.sqrt(ssum / max(1, len(samples)))
+        x = np.frombuffer(raw, dtype="<i2", count=len(raw) // 2)
+        if x.size == 0:
+            return 0.0, 0.0, 0.0
+        if x.size > self._scratch.size:
+            self._scratch = np.empty(x.size, dtype=np.float32)
+        xf = self._scratch[:x.size]
+        np.multiply(x, 1.0 / 32768.0, out=xf, dtype=np.float32)
+        # RMS (dot product maps to BLAS sdot)
+        rms = float(np.sqrt(np.dot(xf, xf) / x.size))
         # ZCR
-        signs = [1 if s>0 else 0 for s in samples]
-        zc = sum(abs(signs[i]-signs[i-1]) for i in range(1, len(signs))) / max(1, len(signs)-1)
+        zc = float(np.count_nonzero(np.diff(x > 0))) / max(1, x.size - 1)
         # peak
-        peak = max(abs(s)/32768.0 for s in samples)
-        return {"rms": rms, "zcr": zc, "peak": peak}
+        peak = float(max(xf.max(), -xf.min()))
+        return rms, zc, peak
+
+    def _make_poller(self):
+        try:
+            poller = select.poll()
+            for fd, mask in self._pcm.polldescriptors():
+                poller.register(fd, mask)
+            return poller
+        except Exception as e:
+            self.log.debug("ALSA poll descriptors unavailable (%s) — using sleep fallback", e)
+            return None
 
     def _thread_main(self):
+        poller = self._make_poller()
         while self._running:
             try:
+                # read first: a PREPARED capture stream only starts on read and
+                # never polls readable before that (also after an overrun)
                 l, data = self._pcm.read()
-                if l:
-                    levels = self._compute_levels(data)
-                    with self._lock:
-                        self._latest.update(levels)
-                        self._latest["ts"] = time.time()
-                        self._latest["raw"] = data
+                if l > 0:
+                    rms, zcr, peak = self._compute_levels(data)
+                    # single attribute store: atomic under the GIL
+                    self._latest = LevelSnap(rms, zcr, peak, time.time(), data)
+                elif l < 0:
+                    self.log.debug("ALSA capture overrun")
+                elif poller is not None:
+                    # running but no full period yet: wait for one; timeout so stop() is noticed
+                    poller.poll(200)
                 else:
                     time.sleep(0.01)
             except Exception as e:
@@ -85,5 +133,5 @@ class AudioCapture:
                 time.sleep(0.1)
 
     def get_levels(self):
-        with self._lock:
-            return dict(self._latest)
\ No newline at end of file
+        """Latest LevelSnap(rms, zcr, peak, ts, raw)."""
+        return self._latest
\ No newline at end of file
@@ -4,10 +4,11 @@ Blink controller that issues eye-close/open commands to a ServoController.
 Implements blink suppression while the mouth is active. Accepts an optional
 mouth_servo to decide when blinking should be suppressed.
 """
-import threading
 import time
-import random
+import threading
+import numpy as np
 from src.logger import get_logger
+from src.scheduler import Repeating, get_loop, in_scheduler_thread
 
 class BlinkController:
     def __init__(self, eyes_servo,
@@ -33,22 +34,44 @@ class BlinkController:
         self.suppress_on = float(suppress_mouth_on)
         self.suppress_off = float(suppress_mouth_off)
         self.suppress_off_ms = int(suppress_off_ms)
-        self._running = False
-        self._thread = None
+        self._task = None
+        # pending eye-open of a blink in progress (TimerHandle on the shared loop)
+        self._open_handle = None
+        # ring of pre-drawn exponential waits, refilled in bulk
+        self._rng = np.random.default_rng()
+        self._delays = iter(())
         self.log = get_logger()
         self._last_mouth_low_ts = 0.0
 
     def start(self):
-        if self._thread:
+        if self._task:
             return
-        self._running = True
-        self._thread = threading.Thread(target=self._loop, daemon=True)
-        self._thread.start()
+        self._task = Repeating(self._attempt, name="blink")
+        self._task.start(self._next_wait())
 
     def stop(self):
-        self._running = False
-        if self._thread:
-            self._thread.join(timeout=0.5)
+        if self._task:
+            # also waits out a blink attempt already running on the loop
+            self._task.cancel()
+            self._task = None
+        handle, self._open_handle = self._open_handle, None
+        if handle is None:
+            return
+        if in_scheduler_thread():
+            handle.cancel()
+            return
+        # TimerHandle.cancel isn't thread-safe: run it on the loop and wait, so the
+        # eyes can't be reopened after the caller goes on to stop the eye servo
+        done = threading.Event()
+        def _cancel():
+            handle.cancel()
+            done.set()
+        try:
+            get_loop().call_soon_threadsafe(_cancel)
+            done.wait(0.5)
+        except RuntimeError:
+            # loop already closed
+            pass
 
     def _mouth_level(self):
         """
@@ -70,11 +93,16 @@ class BlinkController:
     def _perform_blink(self):
         try:
             close_angle = self.eyes.min_angle
-            open_angle = getattr(self.eyes, "neutral", self.eyes.max_angle)
-            # close
+            # close, then open once the close has had self.duration to run
             self.eyes.set_target_angle(close_angle, duration_s=self.duration)
-            time.sleep(self.duration)
-            # open
+            self._open_handle = get_loop().call_later(self.duration, self._open_eyes)
+        except Exception as e:
+            self.log.debug("Blink perform error: %s", e)
+
+    def _open_eyes(self):
+        self._open_handle = None
+        try:
+            open_angle = getattr(self.eyes, "neutral", self.eyes.max_angle)
             self.eyes.set_target_angle(open_angle, duration_s=max(0.01, self.duration / 1.5))
         except Exception as e:
             self.log.debug("Blink perform error: %s", e)
@@ -101,16 +129,20 @@ class BlinkController:
         held_ms = (now - self._last_mouth_low_ts) * 1000.0
         return held_ms >= self.suppress_off_ms
 
-    def _loop(self):
-        while self._running:
-            # random wait between blink attempts
-            wait = random.expovariate(1.0 / max(0.1, self.mean))
-            time.sleep(wait)
-            try:
-                if self._can_blink_now():
-                    self._perform_blink()
-                else:
-                    # skip blink attempt; continue loop
-                    continue
-            except Exception as e:
-                self.log.debug("Blink loop error: %s", e)
\ No newline at end of file
+    def _next_wait(self):
+        # random wait between blink attempts (exponential, mean self.mean)
+        wait = next(self._delays, None)
+        if wait is None:
+            self._delays = iter(self._rng.exponential(max(0.1, self.mean), 256).tolist())
+            wait = next(self._delays)
+        return wait
+
+    def _attempt(self):
+        """Scheduler callback: maybe blink, then return the wait until the next attempt."""
+        try:
+            if self._can_blink_now():
+                self._perform_blink()
+                return self.duration + self._next_wait()
+        except Exception as e:
+            self.log.debug("Blink loop error: %s", e)
+        return self._next_wait()
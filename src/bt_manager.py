@@ -1,22 +1,39 @@
 """
-Simple bluetoothctl-based reconnect manager (non-blocking).
+Simple bluetooth reconnect manager (non-blocking).
 Assumes device already paired/trusted.
+Uses the BlueZ D-Bus API (org.bluez.Device1) via dbus-next if available,
+otherwise keeps one bluetoothctl session open and feeds it commands over stdin.
 """
+import asyncio
 import threading
 import time
+import queue
 import subprocess
 from src.logger import get_logger
 
+try:
+    from dbus_next import BusType
+    from dbus_next.aio import MessageBus
+except Exception:
+    MessageBus = None
+
 class BTManager:
     def __init__(self, config):
         self.config = config
         self._mac = config.get("bt_device_mac", "").strip()
+        self._adapter = config.get("bt_adapter", "hci0")
         self._running = False
         self._thread = None
         self._connected = False
         self._last_attempt = 0.0
         self._last_result = ""
         self.log = get_logger()
+        self._btctl = None
+        self._btctl_out = queue.Queue()
+        # D-Bus state; only touched from the manager thread
+        self._aio = None
+        self._bus = None
+        self._dev = None
 
     def start(self):
         if self._thread:
@@ -33,10 +50,113 @@ class BTManager:
     def is_connected(self):
         return self._connected
 
+    def probe(self):
+        """One-off connection check for when the manager thread isn't running."""
+        self._open_dbus()
+        try:
+            return self._check_connected()
+        finally:
+            self._stop_btctl()
+            self._close_dbus()
+
     def last_attempt_info(self):
         return {"ts": self._last_attempt, "result": self._last_result}
 
+    def _open_dbus(self):
+        if MessageBus is None or not self._mac:
+            return
+        aio = asyncio.new_event_loop()
+        try:
+            self._dev = aio.run_until_complete(self._dbus_device())
+            self._aio = aio
+            self.log.info("Using BlueZ D-Bus API for %s", self._mac)
+        except Exception as e:
+            self.log.warning("BlueZ D-Bus unavailable (%s) — using bluetoothctl", e)
+            self._dev = None
+            aio.close()
+
+    async def _dbus_device(self):
+        bus = await MessageBus(bus_type=BusType.SYSTEM).connect()
+        path = f"/org/bluez/{self._adapter}/dev_{self._mac.upper().replace(':', '_')}"
+        try:
+            introspection = await bus.introspect("org.bluez", path)
+        except Exception:
+            bus.disconnect()
+            raise
+        self._bus = bus
+        return bus.get_proxy_object("org.bluez", path, introspection).get_interface("org.bluez.Device1")
+
+    def _close_dbus(self):
+        if self._aio is None:
+            return
+        try:
+            self._bus.disconnect()
+        except Exception:
+            pass
+        self._aio.close()
+        self._aio = self._bus = self._dev = None
+
+    def _start_btctl(self):
+        try:
+            self._btctl = subprocess.Popen(["bluetoothctl"], stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                           stderr=subprocess.STDOUT, text=True, bufsize=1)
+        except Exception as e:
+            self.log.warning("Failed to start bluetoothctl session: %s", e)
+            self._btctl = None
+            return
+        self._btctl_out = queue.Queue()
+        threading.Thread(target=self._read_btctl, args=(self._btctl, self._btctl_out), daemon=True).start()
+
+    def _read_btctl(self, proc, out):
+        # drain bluetoothctl stdout so it never blocks on a full pipe
+        for line in proc.stdout:
+            out.put(line)
+
+    def _stop_btctl(self):
+        proc, self._btctl = self._btctl, None
+        if proc is None:
+            return
+        try:
+            proc.stdin.write("quit\n")
+            proc.stdin.flush()
+            proc.wait(timeout=1.0)
+        except Exception:
+            proc.kill()
+
+    def _send(self, cmd, until, timeout):
+        """
+        Send cmd to the long-lived bluetoothctl and collect output until a line
+        contains one of the `until` markers or timeout seconds pass.
+        """
+        if self._btctl is None or self._btctl.poll() is not None:
+            self._start_btctl()
+            if self._btctl is None:
+                return self._run_btctl(cmd)
+        # discard async events/leftovers from earlier commands
+        while True:
+            try:
+                self._btctl_out.get_nowait()
+            except queue.Empty:
+                break
+        self._btctl.stdin.write(cmd + "\n")
+        self._btctl.stdin.flush()
+        lines = []
+        deadline = time.time() + timeout
+        while True:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                break
+            try:
+                line = self._btctl_out.get(timeout=remaining)
+            except queue.Empty:
+                break
+            lines.append(line)
+            if any(u in line for u in until):
+                break
+        return "".join(lines)
+
     def _run_btctl(self, cmd):
+        # one-shot fallback when the persistent session can't be started
         p = subprocess.Popen(["bluetoothctl"], stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
         out, err = p.communicate(cmd + "\n")
         return out
@@ -44,18 +164,39 @@ class BTManager:
     def _check_connected(self):
         if not self._mac:
             return False
-        out = self._run_btctl(f"info {self._mac}")
+        if self._dev is not None:
+            return bool(self._aio.run_until_complete(self._dev.get_connected()))
+        out = self._send(f"info {self._mac}", until=("Connected:", "not available"), timeout=2.0)
         return "Connected: yes" in out
 
     def _connect(self):
         if not self._mac:
             return False
         self.log.info("Attempting bluetooth connect to %s", self._mac)
-        out = self._run_btctl(f"connect {self._mac}")
+        if self._dev is not None:
+            try:
+                self._aio.run_until_complete(self._dev.call_connect())
+            except Exception as e:
+                self._last_result = str(e)
+                return False
+            self._last_result = "Connection successful"
+            return True
+        out = self._send(f"connect {self._mac}",
+                         until=("Connection successful", "Failed to connect", "not available"), timeout=10.0)
         self._last_result = out.strip()
         return "Connection successful" in out or "Successful" in out or "Connected: yes" in out
 
     def _loop(self):
+        self._open_dbus()
+        try:
+            self._reconnect_loop()
+        finally:
+            # torn down here, on the owning thread: a stop() join can time out
+            # while _send is still talking to the session
+            self._stop_btctl()
+            self._close_dbus()
+
+    def _reconnect_loop(self):
         backoff = 1.0
         while self._running:
             try:
@@ -1,6 +1,11 @@
 import json
 import os
 
+try:
+    import orjson
+except Exception:
+    orjson = None
+
 def load_config(path=None):
     if path is None:
         path = os.path.join(os.path.dirname(__file__), "..", "config.json")
@@ -11,5 +16,11 @@ def load_config(path=None):
     return cfg
 
 def save_config(path, config):
-    with open(path, "w") as f:
-        json.dump(config, f, indent=2)
\ No newline at end of file
+    # drop runtime-only keys (e.g. "_path" injected by load_config)
+    clean = {k: v for k, v in config.items() if not k.startswith("_")}
+    if orjson is not None:
+        with open(path, "wb") as f:
+            f.write(orjson.dumps(clean, option=orjson.OPT_INDENT_2))
+    else:
+        with open(path, "w") as f:
+            json.dump(clean, f, indent=2)
@@ -0,0 +1,72 @@
+"""
+Shared scheduler: one asyncio event loop on a daemon thread that runs the
+periodic callbacks of the servo and blink controllers, so they share a single
+OS thread and wakeup source instead of each sleeping in its own Thread.
+"""
+import asyncio
+import threading
+from src.logger import get_logger
+
+_loop = None
+_thread = None
+_lock = threading.Lock()
+
+def _run(loop):
+    asyncio.set_event_loop(loop)
+    loop.run_forever()
+
+def get_loop():
+    """Return the shared event loop, starting its thread on first use."""
+    global _loop, _thread
+    with _lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            _thread = threading.Thread(target=_run, args=(_loop,), name="teddy-scheduler", daemon=True)
+            _thread.start()
+    return _loop
+
+def in_scheduler_thread():
+    return _thread is not None and threading.current_thread() is _thread
+
+class Repeating:
+    """
+    Calls fn() on the shared loop; fn returns the delay in seconds until its
+    next call, or None to stop. start()/cancel() are safe from any thread.
+    """
+    def __init__(self, fn, name=""):
+        self._fn = fn
+        self._name = name or getattr(fn, "__qualname__", "task")
+        self._cancelled = False
+        self._loop = get_loop()
+        self.log = get_logger()
+
+    def start(self, delay=0.0):
+        self._loop.call_soon_threadsafe(self._schedule, delay)
+
+    def _schedule(self, delay):
+        if not self._cancelled:
+            self._loop.call_later(delay, self._call)
+
+    def _call(self):
+        if self._cancelled:
+            return
+        try:
+            delay = self._fn()
+        except Exception as e:
+            self.log.exception("Scheduled task %s exception: %s", self._name, e)
+            delay = 0.05
+        if delay is not None:
+            self._schedule(delay)
+
+    def cancel(self, timeout=0.5):
+        """Stop rescheduling; waits (up to timeout) for a call in progress to finish."""
+        self._cancelled = True
+        if in_scheduler_thread():
+            return
+        try:
+            done = threading.Event()
+            self._loop.call_soon_threadsafe(done.set)
+            done.wait(timeout)
+        except RuntimeError:
+            # loop already closed
+            pass
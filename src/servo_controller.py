@@ -3,17 +3,26 @@
 Servo controller with pigpio if available, otherwise simulated.
 Implements symmetric ease-in / ease-out when a duration is specified.
 Exposes start(), set_target_angle(angle, duration_s=None) and stop().
+With pigpio, eased moves are preloaded as a waveform and timed by the daemon.
 """
 import math
 import time
-from threading import Thread, Event
+from array import array
+from threading import Lock
 from src.logger import get_logger
+from src.scheduler import Repeating
 
 try:
     import pigpio
 except Exception:
     pigpio = None
 
+SERVO_PERIOD_US = 20000
+
+# The pigpio daemon transmits one waveform at a time, shared by all controllers
+_wave_lock = Lock()
+_wave_owner = None
+
 class ServoController:
     def __init__(self, pin:int, min_angle:int=0, max_angle:int=180, neutral:int=90,
                  pulse_min_ms:float=0.5, pulse_max_ms:float=2.5, max_speed_deg_per_s:float=180.0):
@@ -27,15 +36,22 @@ class ServoController:
         self.max_speed = float(max_speed_deg_per_s)
         self.log = get_logger()
 
+        # Precomputed ease curve (0.5 - 0.5*cos(pi*t), 256 steps) and linear
+        # angle -> microseconds mapping so the 50Hz loop does no trig/division
+        self._ease_lut = array("f", [0.5 - 0.5 * math.cos(math.pi * i / 256) for i in range(257)])
+        self._pulse_scale = (self.pulse_max_ms - self.pulse_min_ms) * 1000.0 / max(1.0, (self.max_angle - self.min_angle))
+        self._pulse_base = self.pulse_min_ms * 1000.0 - self.min_angle * self._pulse_scale
+
         # Move/easing state
         self._move_start_angle = self.angle
         self._move_target_angle = self.angle
         self._move_start_ts = None
         self._move_duration = None
+        self._wave_id = None
 
-        # Thread control (do NOT start thread here)
-        self._stop_event = Event()
-        self._thread = None
+        # Periodic tick on the shared scheduler (do NOT start it here)
+        self._task = None
+        self._prev_tick_ts = None
 
         # pigpio handle if available
         self._pi = None
@@ -48,19 +64,17 @@ class ServoController:
                 self._pi = None
 
     def start(self):
-        """Start the background servo worker thread. Safe to call multiple times."""
-        if self._thread and self._thread.is_alive():
+        """Start the 50Hz servo tick on the shared scheduler. Safe to call multiple times."""
+        if self._task:
             return
-        self._stop_event.clear()
-        self._thread = Thread(target=self._thread_run, daemon=True)
-        self._thread.start()
-        self.log.debug("Servo(pin=%s) thread started", self.pin)
+        self._prev_tick_ts = time.time()
+        self._task = Repeating(self._tick, name=f"servo-{self.pin}")
+        self._task.start()
+        self.log.debug("Servo(pin=%s) tick started", self.pin)
 
     def _angle_to_pulse(self, angle):
         # map angle to microseconds
-        frac = (angle - self.min_angle) / max(1.0, (self.max_angle - self.min_angle))
-        ms = self.pulse_min_ms + frac * (self.pulse_max_ms - self.pulse_min_ms)
-        return int(ms * 1000)
+        return int(self._pulse_base + angle * self._pulse_scale)
 
     def set_target_angle(self, angle:int, duration_s:float=None):
         """
@@ -69,6 +83,15 @@ class ServoController:
         """
         angle = max(self.min_angle, min(self.max_angle, int(angle)))
         if duration_s and duration_s > 0.0:
+            # callers re-issue the same target every tick; only a changed
+            # move is worth a new waveform (rebuilding cuts the pulse train)
+            if self._move_duration is not None and angle == self._move_target_angle \
+                    and float(duration_s) == self._move_duration:
+                return
+            if self._move_duration is None and angle == int(self.angle):
+                # already there: keep holding
+                self.target = angle
+                return
             # start a duration-based eased move from current angle -> angle
             self._move_start_angle = int(self.angle)
             self._move_target_angle = int(angle)
@@ -76,12 +99,81 @@ class ServoController:
             self._move_duration = float(duration_s)
             # Keep target in sync for fallback
             self.target = int(angle)
+            if not self._start_wave_move(self._move_start_angle, self._move_target_angle, self._move_duration):
+                # the 50Hz tick drives the move instead
+                self._finish_wave(self._wave_id)
         else:
             # immediate / speed-limited move to target angle
             self._move_duration = None
             self.target = int(angle)
+            self._finish_wave(self._wave_id)
         self.log.debug("Servo(pin=%s) set_target_angle target=%s duration=%s", self.pin, angle, duration_s)
 
+    def _start_wave_move(self, start_angle, target_angle, duration_s):
+        """
+        Preload the whole eased move as one pigpio waveform (one pulse per 20ms
+        servo period) and send it once. Returns False if pigpio is unavailable
+        or the wave engine is busy with another servo's move.
+        """
+        global _wave_owner
+        if not self._pi:
+            return False
+        steps = max(1, int(round(duration_s * 1e6 / SERVO_PERIOD_US)))
+        mask = 1 << self.pin
+        pulses = []
+        for k in range(1, steps + 1):
+            ease = self._ease_lut[(k * 256) // steps]
+            width = self._angle_to_pulse(start_angle + (target_angle - start_angle) * ease)
+            pulses.append(pigpio.pulse(mask, 0, width))
+            pulses.append(pigpio.pulse(0, mask, SERVO_PERIOD_US - width))
+        with _wave_lock:
+            try:
+                if _wave_owner is not self and self._pi.wave_tx_busy():
+                    return False
+                if self._wave_id is not None:
+                    self._pi.wave_tx_stop()
+                    self._pi.wave_delete(self._wave_id)
+                    self._wave_id = None
+                # hand the pin from the servo pulse generator to the waveform
+                self._pi.set_servo_pulsewidth(self.pin, 0)
+                self._pi.set_mode(self.pin, pigpio.OUTPUT)
+                self._pi.wave_add_generic(pulses)
+                wid = self._pi.wave_create()
+                self._pi.wave_send_once(wid)
+                self._wave_id = wid
+                _wave_owner = self
+                return True
+            except Exception as e:
+                self.log.debug("Servo(pin=%s) waveform move failed: %s", self.pin, e)
+                return False
+
+    def _finish_wave(self, wid):
+        """Release waveform wid (if still current) and hold the current angle with servo pulses."""
+        global _wave_owner
+        if wid is None:
+            return
+        with _wave_lock:
+            if self._wave_id != wid:
+                return
+            try:
+                if _wave_owner is self:
+                    self._pi.wave_tx_stop()
+                self._pi.wave_delete(wid)
+            except Exception:
+                pass
+            self._wave_id = None
+            if _wave_owner is self:
+                _wave_owner = None
+            # still under the lock so a new move can't start between release and hold
+            self._apply_pulse(self.angle)
+
+    def _drive_pulse(self, angle):
+        """Tick-side pulse update; skipped while a waveform owns (or is taking over) the pin."""
+        with _wave_lock:
+            # _start_wave_move turns servo pulses off and sets _wave_id under this lock
+            if self._wave_id is None:
+                self._apply_pulse(angle)
+
     def _apply_pulse(self, angle):
         pulse = self._angle_to_pulse(angle)
         if self._pi:
@@ -94,54 +186,54 @@ class ServoController:
             # simulated: occasional debug log
             self.log.debug("Servo(pin=%s) -> angle=%s pulse=%s us", self.pin, angle, pulse)
 
-    def _thread_run(self):
-        prev = time.time()
-        while not self._stop_event.is_set():
-            now = time.time()
-            dt = now - prev
-            prev = now
-            try:
-                if self._move_duration and self._move_start_ts is not None:
-                    # duration-based ease-in/ease-out move
-                    elapsed = now - self._move_start_ts
-                    t = min(1.0, elapsed / max(1e-6, self._move_duration))
-                    # symmetric ease in / ease out: ease = 0.5 - 0.5*cos(pi * t)
-                    ease = 0.5 - 0.5 * math.cos(math.pi * t)
-                    new_angle = int(round(self._move_start_angle + (self._move_target_angle - self._move_start_angle) * ease))
-                    self.angle = new_angle
-                    self._apply_pulse(self.angle)
-                    if t >= 1.0:
-                        # complete
-                        self._move_duration = None
-                        self._move_start_ts = None
-                        self.target = self._move_target_angle
-                else:
-                    # velocity-limited stepping toward self.target
-                    if self.angle != self.target:
-                        max_step = self.max_speed * dt
-                        diff = self.target - self.angle
-                        if abs(diff) <= max_step:
-                            self.angle = self.target
-                        else:
-                            step = max_step if diff > 0 else -max_step
-                            # angles are ints
-                            self.angle = int(round(self.angle + step))
-                        self._apply_pulse(self.angle)
-                # sleep a little for responsive control
-                time.sleep(0.02)
-            except Exception as e:
-                self.log.exception("Servo thread exception: %s", e)
-                time.sleep(0.05)
+    def _tick(self):
+        """One control step; returns the delay until the next step."""
+        now = time.time()
+        dt = now - self._prev_tick_ts
+        self._prev_tick_ts = now
+        try:
+            if self._move_duration and self._move_start_ts is not None:
+                # duration-based ease-in/ease-out move; if a waveform is
+                # playing it, only track the angle
+                wid = self._wave_id
+                elapsed = now - self._move_start_ts
+                t = min(1.0, elapsed / max(1e-6, self._move_duration))
+                # symmetric ease in / ease out: ease = 0.5 - 0.5*cos(pi * t)
+                ease = self._ease_lut[int(t * 256)]
+                new_angle = int(round(self._move_start_angle + (self._move_target_angle - self._move_start_angle) * ease))
+                self.angle = new_angle
+                if wid is None:
+                    self._drive_pulse(self.angle)
+                if t >= 1.0:
+                    # complete
+                    self._finish_wave(wid)
+                    self._move_duration = None
+                    self._move_start_ts = None
+                    self.target = self._move_target_angle
+            else:
+                # velocity-limited stepping toward self.target
+                if self.angle != self.target:
+                    max_step = self.max_speed * dt
+                    diff = self.target - self.angle
+                    if abs(diff) <= max_step:
+                        self.angle = self.target
+                    else:
+                        step = max_step if diff > 0 else -max_step
+                        # angles are ints
+                        self.angle = int(round(self.angle + step))
+                    self._drive_pulse(self.angle)
+            # tick again shortly for responsive control
+            return 0.02
+        except Exception as e:
+            self.log.exception("Servo tick exception: %s", e)
+            return 0.05
 
     def stop(self):
-        """Stop the background thread and release pigpio resources if any."""
-        self._stop_event.set()
-        try:
-            if self._thread:
-                self._thread.join(timeout=0.5)
-        except Exception:
-            pass
-        self._thread = None
+        """Stop the servo tick and release pigpio resources if any."""
+        if self._task:
+            self._task.cancel()
+            self._task = None
+        self._finish_wave(self._wave_id)
         if self._pi:
             try:
                 self._pi.set_servo_pulsewidth(self.pin, 0)
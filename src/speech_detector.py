@@ -6,21 +6,19 @@ Returns dicts with vocalness, rms, zcr, centroid for telemetry and decisions.
 """
 import math
 import time
+import numpy as np
 from src.logger import get_logger
+from src import _goertzel_nb
 
-def goertzel(samples, sample_rate, freq):
-    # Simple Goertzel implementation returning magnitude
-    s_prev = 0.0
-    s_prev2 = 0.0
-    normalized_freq = float(freq) / sample_rate
-    coeff = 2.0 * math.cos(2.0 * math.pi * normalized_freq)
-    for s in samples:
-        s_val = s
-        s = s_val + coeff * s_prev - s_prev2
-        s_prev2 = s_prev
-        s_prev = s
-    mag = math.sqrt(max(0.0, s_prev2*s_prev2 + s_prev*s_prev - coeff*s_prev*s_prev2))
-    return mag
+try:
+    import numpy_rms
+except Exception:
+    numpy_rms = None
+
+try:
+    import ultrafastgoertzel
+except Exception:
+    ultrafastgoertzel = None
 
 class SpeechDetector:
     def __init__(self, config):
@@ -28,51 +26,84 @@ class SpeechDetector:
         self.log = get_logger()
         self.sample_rate = int(config["audio"].get("sample_rate", 44100))
         self.goertzel_freqs = config["speech"].get("goertzel_freqs", [300, 500, 1000])
+        self._freqs_arr = np.asarray(self.goertzel_freqs, dtype=np.float64)
+        # per-bin 2*cos(w), shared by every frame
+        self._coeffs = 2.0 * np.cos(2.0 * np.pi * self._freqs_arr / self.sample_rate)
+        self._freq_max = float(max(self.goertzel_freqs))
+        # cycles/sample, as ultrafastgoertzel takes them
+        self._norm_freqs = self._freqs_arr / self.sample_rate
+        # reused float32 frame buffer for the non-numba RMS path
+        self._scratch = np.empty(int(config["audio"].get("frame_size", 2048)), dtype=np.float32)
         self.weights = config["speech"].get("vocalness_weights", {"rms":0.6,"centroid":0.3,"zcr":0.1})
         self.rms_threshold = config["speech"].get("rms_threshold", 0.02)
         self.zcr_threshold = config["speech"].get("zcr_threshold", 0.05)
         self.on_th = config["speech"].get("vocalness_threshold_on", 0.45)
         self.off_th = config["speech"].get("vocalness_threshold_off", 0.30)
+        # power-weighted centroid sits a little lower than the old magnitude-weighted one
+        self.centroid_threshold = config["speech"].get("centroid_threshold", 0.44)
         self.off_hold_ms = config["speech"].get("off_hold_ms", 200)        # require this ms of continuous below to clear
         self.hysteresis_state = False
         # initialize last_above timestamp to now to avoid immediate clear on startup
-        self._last_above_ts = time.time()
-        self._last_change_ts = time.time()
+        self._last_above_ts = time.monotonic()
+        self._last_change_ts = time.monotonic()
+
+    def _goertzel_power(self, samples):
+        """Goertzel power |X|^2 for all goertzel_freqs in one pass over samples."""
+        if ultrafastgoertzel is not None and not _goertzel_nb.compiled:
+            # Rust/SIMD batch beats the interpreted loops; it returns magnitudes
+            # scaled by 2/N on a float64 signal, rescaled here to match the kernel
+            mags = ultrafastgoertzel.goertzel_batch(samples.astype(np.float64), self._norm_freqs)
+            mags = np.asarray(mags) * (samples.size / (2.0 * 32768.0))
+            return mags * mags
+        return _goertzel_nb.goertzel_power_batch(samples, self._coeffs)
 
     def compute_vocalness(self, raw_bytes):
         """
         Returns a dict: { vocalness, rms, zcr, centroid }
-        Safe for empty raw_bytes.
+        Safe for empty raw_bytes. Frames below half the RMS threshold report
+        vocalness and centroid as 0 without running the Goertzel bins.
         """
         if not raw_bytes:
             return {"vocalness": 0.0, "rms": 0.0, "zcr": 0.0, "centroid": 0.0}
-        import struct
         n = len(raw_bytes)//2
         if n <= 0:
             return {"vocalness": 0.0, "rms": 0.0, "zcr": 0.0, "centroid": 0.0}
-        fmt = "<" + "h"*n
         try:
-            ints = struct.unpack(fmt, raw_bytes)
+            # zero-copy int16 view; features are scaled to full-scale only at the end
+            samples = np.frombuffer(raw_bytes, dtype="<i2")
         except Exception:
             return {"vocalness": 0.0, "rms": 0.0, "zcr": 0.0, "centroid": 0.0}
-        samples = [s/32768.0 for s in ints]
-        # RMS
-        rms = math.sqrt(sum(s*s for s in samples)/max(1, len(samples)))
-        # ZCR (use sign changes)
-        signs = [1 if s>0 else 0 for s in samples]
-        zcr = sum(abs(signs[i]-signs[i-1]) for i in range(1,len(signs))) / max(1, len(signs)-1)
-        # spectral centroid approx using Goertzel magnitudes
-        mags = []
-        for f in self.goertzel_freqs:
-            try:
-                mags.append(goertzel(samples, self.sample_rate, f))
-            except Exception:
-                mags.append(0.0)
+        if _goertzel_nb.features is not None:
+            # RMS and ZCR fused into one compiled pass over the frame
+            sumsq, zc = _goertzel_nb.features(samples)
+            rms = math.sqrt(sumsq / n) / 32768.0
+        else:
+            if n > self._scratch.size:
+                self._scratch = np.empty(n, dtype=np.float32)
+            xf = self._scratch[:n]
+            np.multiply(samples, 1.0 / 32768.0, out=xf, dtype=np.float32)
+            # RMS: SIMD C kernel if numpy-rms is installed, else dot (BLAS sdot)
+            if numpy_rms is not None:
+                rms = float(numpy_rms.rms(xf, window_size=n)[0])
+            else:
+                rms = float(np.sqrt(np.dot(xf, xf) / n))
+            # ZCR (use sign changes)
+            zc = np.count_nonzero(np.diff(samples > 0))
+        zcr = float(zc) / max(1, n - 1)
+        # clearly silent: is_vocal needs rms > rms_threshold anyway, so skip
+        # the Goertzel bins; the 0.5 margin keeps near-threshold frames exact
+        if rms < self.rms_threshold * 0.5:
+            return {"vocalness": 0.0, "rms": rms, "zcr": zcr, "centroid": 0.0}
+        # spectral centroid approx, power-weighted over the Goertzel bins
+        try:
+            power = self._goertzel_power(samples)
+        except Exception:
+            power = np.zeros(len(self.goertzel_freqs))
         centroid = 0.0
-        s_mags = sum(mags)
-        if s_mags > 0:
-            centroid = sum(freq*m for freq,m in zip(self.goertzel_freqs, mags)) / s_mags
-            centroid = centroid / max(self.goertzel_freqs)  # normalize to ~0..1
+        s_pow = float(power.sum())
+        if s_pow > 0:
+            centroid = float(np.dot(self._freqs_arr, power)) / s_pow
+            centroid /= self._freq_max  # normalize to ~0..1
         # Combine features into vocalness
         w = self.weights
         rms_term = min(1.0, rms / max(1e-6, self.rms_threshold * 4))
@@ -83,13 +114,14 @@ class SpeechDetector:
         vocal = max(0.0, min(1.0, vocal))
         return {"vocalness": vocal, "rms": rms, "zcr": zcr, "centroid": centroid}
 
-    def is_vocal(self, raw_bytes):
+    def is_vocal(self, raw_bytes, now=None):
         """
         Implements decision:
           rms > threshold_rms AND
           vocalness >= on_th AND
-          (centroid > 0.45 OR (1 - zcr_norm) > 0.55)
+          (centroid > centroid_threshold OR (1 - zcr_norm) > 0.55)
         plus off-hold hysteresis: only clear after off_hold_ms continuous below.
+        now: timestamp of this tick (time.monotonic()); sampled here if not given.
         Returns: { "vocal": bool, "info": compute_vocalness(...) }
         """
         info = self.compute_vocalness(raw_bytes)
@@ -97,18 +129,16 @@ class SpeechDetector:
         rms = info["rms"]
         zcr = info["zcr"]
         centroid = info["centroid"]
-        now = time.time()
+        if now is None:
+            now = time.monotonic()
 
         # normalize zcr to 0..1 for voicedness test
         zcr_norm = min(1.0, zcr / max(1e-6, self.zcr_threshold * 4))
-        voicedness = (1.0 - zcr_norm) > 0.55
-        centroid_ok = centroid > 0.45
-        rms_ok = rms > self.rms_threshold
-        vocal_ok = v >= self.on_th
-
-        candidate = rms_ok and vocal_ok and (centroid_ok or voicedness)
+        # rms_ok & vocal_ok & (centroid_ok | voicedness), evaluated as one expression
+        passed = ((rms > self.rms_threshold) & (v >= self.on_th)
+                  & ((centroid > self.centroid_threshold) | ((1.0 - zcr_norm) > 0.55)))
 
-        if candidate:
+        if passed:
             # mark last above time and set state true
             self._last_above_ts = now
             self.hysteresis_state = True
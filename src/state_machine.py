@@ -5,8 +5,10 @@ Very small Teddy state machine (Round 3 refinements):
 - Emits speech_confidence in telemetry
 - Enforces min-open time for mouth and checks eyes proximity before SLEEP
 """
+import os
 import time
 import json
+import threading
 from src.logger import get_logger, log_throttle
 from src.audio_capture import AudioCapture
 from src.speech_detector import SpeechDetector
@@ -14,6 +16,11 @@ from src.servo_controller import ServoController
 from src.blink_controller import BlinkController
 from src.bt_manager import BTManager
 
+try:
+    import orjson
+except Exception:
+    orjson = None
+
 class TeddyStateMachine:
     def __init__(self, config):
         self.config = config
@@ -61,7 +68,7 @@ class TeddyStateMachine:
         self.running = False
         self.state = "INIT"
 
-        # speech/mouth timing
+        # speech/mouth timing (time.monotonic(); converted to wall time for telemetry)
         self.last_vocal_ts = 0.0
         self.min_open_ms = config.get("speech",{}).get("min_open_time_ms", 160)
         self.idle_timeout = config.get("speech",{}).get("idle_timeout_s", 10)
@@ -73,6 +80,13 @@ class TeddyStateMachine:
         self._status_write_interval = telemetry_cfg.get("write_interval_s", 1.0)
         self._last_status_write_ts = 0.0
         self._last_vocalness = 0.0
+        self._status_fd = None
+        self._status_len = 0
+        # latest status for the writer thread (last wins; plain attribute swap under the GIL)
+        self._status_slot = None
+        self._status_event = threading.Event()
+        self._status_stop = False
+        self._status_thread = None
 
     def start_subsystems(self):
         # Start servo threads first so blink controller has servo state available
@@ -89,6 +103,16 @@ class TeddyStateMachine:
         self.bt.start()
         # Start blinker after servos
         self.blinker.start()
+        # status file stays open; each write rewrites it in place
+        try:
+            self._status_fd = os.open(self._status_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+            self._status_len = 0
+        except Exception as e:
+            self.log.debug("Failed to open status file: %s", e)
+        # file I/O happens off the main loop so a stalled SD card can't delay a tick
+        self._status_stop = False
+        self._status_thread = threading.Thread(target=self._status_writer_main, name="teddy-status", daemon=True)
+        self._status_thread.start()
 
     def stop_subsystems(self):
         # stop in reverse order
@@ -112,20 +136,84 @@ class TeddyStateMachine:
             self.eyes.stop()
         except Exception:
             pass
+        if self._status_thread is not None:
+            # writer flushes whatever is pending, closes the fd, then exits
+            self._status_stop = True
+            self._status_event.set()
+            self._status_thread.join(timeout=1.0)
+            if self._status_thread.is_alive():
+                # stalled in I/O: closing here could let its pwrite land in a
+                # reused fd, so the writer closes it on its way out instead
+                self.log.debug("Status writer still busy; leaving it to close the status file")
+                return
+            self._status_thread = None
+        self._close_status_fd()
 
-    def _write_status(self):
+    def _close_status_fd(self):
+        if self._status_fd is not None:
+            try:
+                os.close(self._status_fd)
+            except Exception:
+                pass
+            self._status_fd = None
+
+    def _last_vocal_wall(self, wall, now):
+        # last_vocal_ts is monotonic; report it on the wall clock
+        if not self.last_vocal_ts:
+            return 0.0
+        return wall - (now - self.last_vocal_ts)
+
+    def _write_status(self, now=None):
         try:
+            wall = time.time()
+            if now is None:
+                now = time.monotonic()
             status = {
                 "state": self.state,
                 "bt_connected": self.bt.is_connected(),
-                "last_vocal_ts": self.last_vocal_ts,
+                "last_vocal_ts": self._last_vocal_wall(wall, now),
                 "speech_confidence": self._last_vocalness,
                 "mouth_angle": self.mouth.angle,
                 "eyes_angle": self.eyes.angle,
-                "ts": time.time()
+                "ts": wall
             }
-            with open(self._status_path, "w") as f:
-                json.dump(status, f)
+        except Exception as e:
+            self.log.debug("Failed to collect status: %s", e)
+            return
+        if self._status_thread is None:
+            self._flush_status(status)
+            return
+        self._status_slot = status
+        self._status_event.set()
+
+    def _status_writer_main(self):
+        while True:
+            self._status_event.wait()
+            self._status_event.clear()
+            status = self._status_slot
+            if status is not None:
+                self._flush_status(status)
+            if self._status_stop:
+                self._close_status_fd()
+                return
+
+    def _flush_status(self, status):
+        try:
+            if orjson is not None:
+                buf = orjson.dumps(status)
+            else:
+                buf = json.dumps(status).encode()
+            if self._status_fd is None:
+                with open(self._status_path, "wb") as f:
+                    f.write(buf)
+                return
+            # pad with spaces (valid trailing JSON whitespace) instead of truncating,
+            # so a single pwrite replaces the document and readers never see it short
+            n = len(buf)
+            if n < self._status_len:
+                buf += b" " * (self._status_len - n)
+            os.pwrite(self._status_fd, buf, 0)
+            self._status_len = max(self._status_len, n)
         except Exception as e:
             self.log.debug("Failed to write status: %s", e)
 
@@ -135,22 +223,25 @@ class TeddyStateMachine:
         self.state = "RUNNING"
         self.log.info("Teddy state machine started")
         try:
+            # absolute deadlines so loop-body time doesn't stretch the tick
+            next_t = time.monotonic()
             while self.running:
-                levels = self.audio.get_levels()
-                raw = levels.get("raw", b"")
-                det_res = self.detector.is_vocal(raw)
+                # one clock read per tick, shared by the detector, timers and telemetry
+                now = time.monotonic()
+                raw = self.audio.get_levels().raw
+                det_res = self.detector.is_vocal(raw, now=now)
                 vocal_now = det_res.get("vocal", False)
                 info = det_res.get("info", {})
                 self._last_vocalness = info.get("vocalness", 0.0)
 
-                now = time.time()
                 if vocal_now:
                     # register vocal and open mouth
                     self.last_vocal_ts = now
                     # quick open when speaking; duration small to follow plosives
                     self.mouth.set_target_angle(self.mouth.max_angle, duration_s=0.05)
+                    # logger-style args: info is only formatted when the throttle lets it through
                     log_throttle("vocal", self.config.get("logging",{}).get("throttle_s",5.0),
-                                 msg="Vocal detected: %s" % (info,))
+                                 "info", "Vocal detected: %s", info)
                 else:
                     # if enough time since last vocal, close mouth to neutral/min
                     if (now - self.last_vocal_ts) * 1000.0 > self.min_open_ms:
@@ -175,10 +266,16 @@ class TeddyStateMachine:
 
                 # telemetry writes at interval
                 if now - self._last_status_write_ts >= self._status_write_interval:
-                    self._write_status()
+                    self._write_status(now)
                     self._last_status_write_ts = now
 
-                time.sleep(self.tick_s)
+                next_t += self.tick_s
+                delay = next_t - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+                else:
+                    # overran the tick: drop it rather than bursting to catch up
+                    next_t = time.monotonic()
         finally:
             self.stop()
 
@@ -193,6 +290,6 @@ class TeddyStateMachine:
         return {
             "state": self.state,
             "bt_connected": self.bt.is_connected(),
-            "last_vocal_ts": self.last_vocal_ts,
+            "last_vocal_ts": self._last_vocal_wall(time.time(), time.monotonic()),
             "speech_confidence": self._last_vocalness
         }
@@ -4,7 +4,7 @@ Main launcher / CLI for Teddy Bear project.
 
 Usage:
   python3 teddy_bear_project.py start
-  python3 teddy_bear_project.py status
+  python3 teddy_bear_project.py status [--live]
   python3 teddy_bear_project.py calibrate
 """
 import sys
@@ -13,12 +13,13 @@ import json
 from src.config import load_config
 from src.logger import setup_logging, get_logger
 from src.state_machine import TeddyStateMachine
+from src.bt_manager import BTManager
 
 CONFIG_PATH = os.path.join(os.path.dirname(__file__), "config.json")
 
 def main():
     if len(sys.argv) < 2:
-        print("Usage: teddy_bear_project.py [start|status|calibrate]")
+        print("Usage: teddy_bear_project.py [start|status [--live]|calibrate]")
         return
     cmd = sys.argv[1]
     config = load_config(CONFIG_PATH)
@@ -42,9 +43,14 @@ def main():
                 print(json.dumps(data, indent=2))
             except Exception as e:
                 print("Failed to read telemetry file:", e)
+        elif "--live" in sys.argv[2:]:
+            # explicit opt-in: probe bluetooth directly; no servos or audio are touched
+            bt = BTManager(config)
+            print(json.dumps({"probe": True, "bt_connected": bt.probe()}, indent=2))
         else:
             print("No telemetry status file found at", status_path)
-            print("Start the daemon first (python3 teddy_bear_project.py start) to generate status.")
+            print("Start the daemon first (python3 teddy_bear_project.py start) to generate status,")
+            print("or pass --live to probe the bluetooth connection directly.")
     elif cmd == "calibrate":
         import calibrate_cli
         calibrate_cli.run_calibrator(CONFIG_PATH)